@@ -86,5 +86,26 @@ GROUP BY category;
 CREATE INDEX idx_created_at ON love_records(created_at);
 CREATE INDEX idx_category_date ON love_records(category, date);
 
+-- 创建表版本表（每次写入递增对应表的变更计数，用于生成接口缓存校验值）
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name VARCHAR(50) PRIMARY KEY COMMENT '表名',
+    version BIGINT NOT NULL DEFAULT 0 COMMENT '变更计数',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '最近变更时间'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='表版本表';
+
+-- 创建记录月度汇总表（用于按时间分桶的统计分析，应用增删改记录时增量维护）
+CREATE TABLE IF NOT EXISTS love_record_monthly_stats (
+    month DATE NOT NULL COMMENT '月份（当月第一天）',
+    category VARCHAR(50) NOT NULL COMMENT '分类',
+    mood VARCHAR(20) NOT NULL COMMENT '心情标签',
+    record_count INT NOT NULL DEFAULT 0 COMMENT '记录数',
+    PRIMARY KEY (month, category, mood)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci COMMENT='记录月度汇总表';
+
+INSERT INTO love_record_monthly_stats (month, category, mood, record_count)
+SELECT DATE_SUB(date, INTERVAL DAYOFMONTH(date) - 1 DAY) AS month, category, mood, COUNT(*)
+FROM love_records
+GROUP BY month, category, mood;
+
 -- 显示创建结果
 SELECT 'Database initialization completed successfully!' as status;
\ No newline at end of file
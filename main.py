@@ -1,17 +1,31 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
+from starlette.datastructures import Headers, MutableHeaders
 from pydantic import BaseModel
 from typing import List, Optional
 import mysql.connector
 from mysql.connector import Error
 import os
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import json
 import logging
+import asyncio
+import bisect
+import hashlib
+import gzip
+import mimetypes
+import posixpath
+import re
+from email.utils import formatdate, parsedate_to_datetime
 from contextlib import asynccontextmanager
 
+try:
+    import brotli
+except ImportError:  # brotli为可选依赖，未安装时只使用gzip
+    brotli = None
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -30,17 +44,36 @@ DB_CONFIG = {
     'raise_on_warnings': False    # 关闭警告提升为错误
 }
 
+# 数据库初始化命名锁，多个进程同时启动时串行执行初始化
+INIT_LOCK_NAME = 'ky_init_database'
+INIT_LOCK_TIMEOUT = 60
+
+# 响应压缩配置
+COMPRESSION_MINIMUM_SIZE = int(os.getenv('COMPRESSION_MINIMUM_SIZE', 500))  # 小于该字节数的响应不压缩
+STATIC_PRECOMPRESS = os.getenv('STATIC_PRECOMPRESS', 'true').lower() == 'true'  # 启动时预压缩静态文件
+COMPRESSION_THREAD_THRESHOLD = 64 * 1024  # 超过该字节数的响应在线程池中压缩，避免阻塞事件循环
+
+# 读请求合并配置
+READ_COALESCE_TIMEOUT = float(os.getenv('READ_COALESCE_TIMEOUT', 30))  # 等待合并查询结果的超时秒数
+
 # 数据库初始化函数
 def init_database():
     """
     初始化数据库表结构
     会检查表是否存在，不存在才创建
     确保多次启动不会重复初始化
+    通过数据库命名锁串行执行，避免多个进程同时启动时重复创建索引或重复填充汇总表
     """
     connection = get_db_connection()
     cursor = connection.cursor()
+    lock_acquired = False
     
     try:
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (INIT_LOCK_NAME, INIT_LOCK_TIMEOUT))
+        lock_acquired = cursor.fetchone()[0] == 1
+        if not lock_acquired:
+            raise HTTPException(status_code=500, detail="数据库初始化失败: 等待其他进程完成初始化超时")
+        
         # 检查并创建love_records表
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS love_records (
@@ -87,6 +120,41 @@ def init_database():
         """)
         logger.info("operation_logs表检查完成")
         
+        # 检查并创建表版本表，每次写入递增对应表的变更计数，用于生成缓存校验值
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions (
+            table_name VARCHAR(50) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        logger.info("table_versions表检查完成")
+        
+        # 检查并创建love_records的(category, date)索引，供按时间分桶的分析查询使用
+        cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'love_records' AND index_name = 'idx_category_date'
+        """)
+        if cursor.fetchone()[0] == 0:
+            cursor.execute("CREATE INDEX idx_category_date ON love_records(category, date)")
+            logger.info("已创建idx_category_date索引")
+        
+        # 检查并创建记录月度汇总表，增删改记录时增量维护
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS love_record_monthly_stats (
+            month DATE NOT NULL,
+            category VARCHAR(50) NOT NULL,
+            mood VARCHAR(20) NOT NULL,
+            record_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, category, mood)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """)
+        cursor.execute("SELECT EXISTS(SELECT 1 FROM love_record_monthly_stats)")
+        if cursor.fetchone()[0] == 0:
+            populate_monthly_stats(connection)
+            logger.info("已根据love_records填充月度汇总")
+        logger.info("love_record_monthly_stats表检查完成")
+        
         logger.info("数据库表结构检查完成")
         connection.commit()  # 确保DDL操作提交
     except Error as e:
@@ -97,9 +165,50 @@ def init_database():
             logger.error(f"数据库初始化失败: {str(e)}")
             raise HTTPException(status_code=500, detail=f"数据库初始化失败: {str(e)}")
     finally:
+        if lock_acquired:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (INIT_LOCK_NAME,))
+            cursor.fetchone()
         cursor.close()
         connection.close()
 
+# 记录月度汇总维护
+def populate_monthly_stats(connection):
+    """
+    汇总表为空时（如由init_database而非init.sql建表）根据love_records填充月度汇总
+    统计时对love_records加共享锁，并发写入会等待统计完成后再增量调整，或在统计前提交并被计入；
+    写入时直接设置为统计值，不会与并发写入的增量调整重复计数
+    """
+    cursor = connection.cursor()
+    try:
+        connection.start_transaction()
+        cursor.execute("""
+        SELECT DATE_SUB(date, INTERVAL DAYOFMONTH(date) - 1 DAY) AS month, category, mood, COUNT(*)
+        FROM love_records
+        GROUP BY month, category, mood
+        LOCK IN SHARE MODE
+        """)
+        rows = cursor.fetchall()
+        if rows:
+            cursor.executemany("""
+            INSERT INTO love_record_monthly_stats (month, category, mood, record_count)
+            VALUES (%s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE record_count = VALUES(record_count)
+            """, rows)
+        connection.commit()
+    except Error:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def adjust_monthly_stats(cursor, record: dict, delta: int):
+    """按单条记录增量调整月度汇总，delta为1表示新增，-1表示删除"""
+    cursor.execute("""
+    INSERT INTO love_record_monthly_stats (month, category, mood, record_count)
+    VALUES (DATE_SUB(%s, INTERVAL DAYOFMONTH(%s) - 1 DAY), %s, %s, %s)
+    ON DUPLICATE KEY UPDATE record_count = record_count + VALUES(record_count)
+    """, (record['date'], record['date'], record['category'], record['mood'], delta))
+
 # 应用生命周期管理
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -113,10 +222,276 @@ async def lifespan(app: FastAPI):
     init_database()
     logger.info("应用启动完成，数据库已就绪")
     
+    # 启动纪念日提醒调度器
+    reminder_task = asyncio.create_task(reminder_scheduler.run())
+    
     yield
     
     # 关闭时执行（如果需要清理资源）
     logger.info("应用正在关闭...")
+    reminder_task.cancel()
+    try:
+        await reminder_task
+    except asyncio.CancelledError:
+        pass
+
+# 响应压缩
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+def choose_encoding(accept_encoding: str, available=("br", "gzip")) -> Optional[str]:
+    """根据Accept-Encoding选择q值最高的压缩算法，q值相同时优先brotli"""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            qualities[name.strip().lower()] = quality
+    
+    chosen, chosen_quality = None, 0
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and brotli is None:
+            continue
+        quality = qualities.get(encoding, qualities.get("*", 0))
+        if encoding in available and quality > chosen_quality:
+            chosen, chosen_quality = encoding, quality
+    return chosen
+
+def compress_body(body: bytes, encoding: str, static: bool = False) -> bytes:
+    """
+    压缩响应体
+    动态响应使用较低的压缩级别以控制耗时，静态文件只在启动时压缩一次，使用最高级别
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if static else 5)
+    return gzip.compress(body, compresslevel=9 if static else 6, mtime=0)
+
+class CompressionMiddleware:
+    """
+    API响应压缩中间件
+    根据Accept-Encoding协商gzip或brotli，只压缩超过阈值的完整响应体
+    流式响应和已编码的响应原样透传
+    """
+    
+    def __init__(self, app, minimum_size: int = COMPRESSION_MINIMUM_SIZE, path_prefix: str = "/api"):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.path_prefix = path_prefix
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        passthrough = False
+        
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (message.get("more_body", False)
+                    or "content-encoding" in headers
+                    or not is_compressible(headers.get("content-type", ""))
+                    or len(body) < self.minimum_size):
+                # 流式、已编码、不可压缩或过小的响应不处理
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+            
+            if len(body) >= COMPRESSION_THREAD_THRESHOLD:
+                body = await asyncio.to_thread(compress_body, body, encoding)
+            else:
+                body = compress_body(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+        
+        await self.app(scope, receive, send_wrapper)
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    预压缩静态文件服务
+    启动时读取静态目录，为每个文件计算内容哈希，并为可压缩的文件生成gzip/brotli版本
+    HTML中对其他静态文件的引用会改写为带哈希的文件名（如 script.3f2a9c1d07.js），这些资源返回长期不可变缓存头
+    HTML本身返回no-cache，其他文件通过原文件名访问时保持默认的缓存行为
+    内存中只保留HTML内容和压缩版本，其余内容从磁盘读取；文件在启动后被修改时不再使用快照
+    """
+    
+    IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+    HTML_REFERENCE = re.compile(r'(\b(?:src|href)\s*=\s*)(["\'])([^"\']+)\2', re.IGNORECASE)
+    
+    def __init__(self, *args, precompress: bool = True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.assets = {}        # 相对路径 -> 哈希、文件状态、HTML内容及压缩版本
+        self.hashed_paths = {}  # 带哈希的相对路径 -> 相对路径
+        if precompress and self.directory is not None and os.path.isdir(self.directory):
+            self.build_assets()
+    
+    @staticmethod
+    def hashed_name(relative_path: str, digest: str) -> str:
+        stem, ext = posixpath.splitext(relative_path)
+        return f"{stem}.{digest}{ext}"
+    
+    def _file_state(self, relative_path: str):
+        stat = os.stat(os.path.join(self.directory, relative_path))
+        return stat.st_size, stat.st_mtime_ns
+    
+    def _add_asset(self, relative_path: str, content: bytes, media_type: str, state, is_html: bool):
+        digest = hashlib.sha256(content).hexdigest()[:10]
+        variants = {}
+        if is_compressible(media_type) and len(content) >= COMPRESSION_MINIMUM_SIZE:
+            for encoding in ("br", "gzip"):
+                if encoding == "br" and brotli is None:
+                    continue
+                compressed = compress_body(content, encoding, static=True)
+                if len(compressed) < len(content):
+                    variants[encoding] = compressed
+        
+        self.assets[relative_path] = {
+            "media_type": media_type,
+            "hash": digest,
+            "state": state,
+            "content": content if is_html else None,
+            "variants": variants
+        }
+        self.hashed_paths[self.hashed_name(relative_path, digest)] = relative_path
+    
+    def rewrite_html(self, relative_path: str, html: bytes) -> bytes:
+        """把HTML中指向静态文件的相对路径或 /static/ 路径改写为带哈希的文件名"""
+        manifest = self.manifest()
+        base_dir = posixpath.dirname(relative_path)
+        
+        def replace(match):
+            reference = match.group(3)
+            if "?" in reference or "#" in reference or "//" in reference:
+                return match.group(0)
+            if reference.startswith("/static/"):
+                target = posixpath.normpath(reference[len("/static/"):])
+            elif reference.startswith("/"):
+                return match.group(0)
+            else:
+                target = posixpath.normpath(posixpath.join(base_dir, reference))
+            
+            hashed = manifest.get(target)
+            if hashed is None:
+                return match.group(0)
+            new_reference = posixpath.join(posixpath.dirname(reference), posixpath.basename(hashed))
+            return f"{match.group(1)}{match.group(2)}{new_reference}{match.group(2)}"
+        
+        return self.HTML_REFERENCE.sub(replace, html.decode("utf-8")).encode("utf-8")
+    
+    def build_assets(self):
+        """读取静态目录并生成预压缩版本，先处理其他文件，再改写并处理HTML"""
+        html_files = []
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                full_path = os.path.join(root, filename)
+                relative_path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                state = self._file_state(relative_path)
+                with open(full_path, "rb") as f:
+                    content = f.read()
+                
+                if media_type == "text/html":
+                    html_files.append((relative_path, content, media_type, state))
+                else:
+                    self._add_asset(relative_path, content, media_type, state, is_html=False)
+        
+        for relative_path, content, media_type, state in html_files:
+            try:
+                content = self.rewrite_html(relative_path, content)
+            except UnicodeDecodeError:
+                logger.warning(f"静态HTML不是UTF-8编码，跳过引用改写: {relative_path}")
+            self._add_asset(relative_path, content, media_type, state, is_html=True)
+        
+        compressed_count = sum(1 for asset in self.assets.values() if asset["variants"])
+        logger.info(f"静态文件预压缩完成，共 {len(self.assets)} 个文件，其中 {compressed_count} 个已压缩")
+    
+    def manifest(self) -> dict:
+        """原文件名到带哈希文件名的映射"""
+        return {path: hashed for hashed, path in self.hashed_paths.items()}
+    
+    async def get_response(self, path: str, scope):
+        relative_path = path.replace(os.sep, "/")
+        immutable = relative_path in self.hashed_paths
+        if immutable:
+            relative_path = self.hashed_paths[relative_path]
+        elif self.html and scope["path"].endswith("/"):
+            relative_path = posixpath.normpath(posixpath.join(relative_path, "index.html"))
+        
+        asset = self.assets.get(relative_path)
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        
+        # 文件在启动后被修改：带哈希的旧文件名不再有效，原文件名直接从磁盘读取
+        try:
+            state = await asyncio.to_thread(self._file_state, relative_path)
+        except OSError:
+            state = None
+        if state != asset["state"]:
+            if immutable:
+                raise HTTPException(status_code=404)
+            return await super().get_response(path, scope)
+        
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""), tuple(asset["variants"]))
+        
+        if encoding is None and asset["content"] is None:
+            # 未压缩的内容直接从磁盘读取
+            response = await super().get_response(relative_path.replace("/", os.sep), scope)
+            if immutable:
+                response.headers["Cache-Control"] = self.IMMUTABLE_CACHE_CONTROL
+            if asset["variants"]:
+                response.headers["Vary"] = "Accept-Encoding"
+            return response
+        
+        etag = f'"{asset["hash"]}-{encoding}"' if encoding else f'"{asset["hash"]}"'
+        headers = {"ETag": etag}
+        if asset["variants"]:
+            headers["Vary"] = "Accept-Encoding"
+        if immutable:
+            headers["Cache-Control"] = self.IMMUTABLE_CACHE_CONTROL
+        elif asset["content"] is not None:
+            # HTML引用了带哈希的文件名，每次都需要校验
+            headers["Cache-Control"] = "no-cache"
+        else:
+            headers["Last-Modified"] = formatdate(asset["state"][1] / 1e9, usegmt=True)
+        
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            content = asset["variants"][encoding]
+        else:
+            content = asset["content"]
+        return Response(content, media_type=asset["media_type"], headers=headers)
 
 # 创建FastAPI应用实例，使用新的lifespan管理器
 app = FastAPI(
@@ -134,6 +509,9 @@ app.add_middleware(
     allow_headers=["*"],  # 允许所有HTTP头
 )
 
+# 配置响应压缩中间件（gzip/brotli）
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
+
 # Pydantic模型
 class LoveRecord(BaseModel):
     id: Optional[int] = None
@@ -237,14 +615,331 @@ def log_operation(operation_type: str, table_name: str, record_id: int = None,
         if 'connection' in locals():
             connection.close()
 
+# 条件请求（ETag / Last-Modified）支持
+def mark_table_changed(cursor, table_name: str):
+    """
+    递增表的变更计数，使该表相关的缓存校验值失效
+    需在本次写入的所有数据变更（包括月度汇总）完成后调用
+    """
+    cursor.execute("""
+        INSERT INTO table_versions (table_name, version) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE version = version + 1
+    """, (table_name,))
+
+def get_table_version(table_name: str) -> dict:
+    """
+    获取表的版本信息（变更计数、最近变更时间）
+    只按主键读取table_versions中的一行，不扫描数据表
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
+    try:
+        cursor.execute("""
+            SELECT version, UNIX_TIMESTAMP(updated_at) AS updated_at
+            FROM table_versions WHERE table_name = %s
+        """, (table_name,))
+        version = cursor.fetchone() or {}
+        return {
+            "version": version.get('version') or 0,
+            "updated_at": int(version.get('updated_at') or 0)
+        }
+    except Error as e:
+        raise HTTPException(status_code=500, detail=f"查询数据版本失败: {str(e)}")
+    finally:
+        cursor.close()
+        connection.close()
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """按弱比较规则判断 If-None-Match 是否命中"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque_tag:
+            return True
+    return False
+
+async def check_not_modified(request: Request, response: Response, table_name: str, *variant,
+                             daily: bool = False):
+    """
+    根据表版本生成 ETag 和 Last-Modified
+    返回 (304响应或None, 表版本号)，客户端缓存仍然有效时返回304响应，否则把校验头写入response
+    表版本号用作读请求合并键的一部分，保证响应内容不早于所标注的版本
+    variant 为影响响应内容的查询参数
+    daily 表示结果依赖当前日期：ETag包含今天的日期，Last-Modified不早于今天零点
+    """
+    version = await asyncio.to_thread(get_table_version, table_name)
+    last_modified = version['updated_at']
+    if daily:
+        today = date.today()
+        variant = variant + (today.isoformat(),)
+        last_modified = max(last_modified, int(datetime.combine(today, datetime.min.time()).timestamp()))
+    
+    tag_source = json.dumps([table_name, version['version'], variant], default=str)
+    etag = f'W/"{hashlib.md5(tag_source.encode()).hexdigest()}"'
+    
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    
+    not_modified = False
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag)
+    elif if_modified_since and last_modified:
+        try:
+            not_modified = last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            not_modified = False
+    
+    if not_modified:
+        return Response(status_code=304, headers=headers), version['version']
+    
+    response.headers.update(headers)
+    return None, version['version']
+
+# 相同读请求合并（single-flight）
+class SingleFlight:
+    """
+    相同读请求合并器
+    同一时刻相同路由和参数的请求共享同一个进行中的数据库查询及其结果
+    查询在线程池中执行，完成后立即移除，后续请求重新查询
+    单个请求等待超时只影响自身，不会取消共享的查询；查询异常会传递给所有等待者
+    合并键需包含表版本号，避免写入后的请求复用写入前开始的查询
+    """
+    
+    def __init__(self, timeout: float = READ_COALESCE_TIMEOUT):
+        self.timeout = timeout
+        self._inflight = {}
+        self.executed = 0   # 实际执行的查询数
+        self.coalesced = 0  # 被合并（复用进行中查询）的请求数
+        self.timeouts = 0   # 等待超时的请求数
+    
+    def _finish(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 读取异常，避免所有等待者都已超时时出现未处理异常的警告
+        if not task.cancelled():
+            task.exception()
+    
+    async def do(self, key, func, *args):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda finished: self._finish(key, finished))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+        
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise HTTPException(status_code=504, detail="查询超时，请稍后重试")
+    
+    def metrics(self) -> dict:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+            "inflight": len(self._inflight)
+        }
+
+read_flight = SingleFlight()
+
+# 纪念日提醒调度器
+def next_occurrence(anniversary_date: date, is_recurring: bool, today: date) -> Optional[date]:
+    """计算纪念日在今天及之后的下一次发生日期，非重复且已过去的返回None"""
+    if not is_recurring:
+        return anniversary_date if anniversary_date >= today else None
+    
+    for year in (today.year, today.year + 1):
+        try:
+            occurrence = anniversary_date.replace(year=year)
+        except ValueError:
+            # 2月29日在平年按2月28日处理
+            occurrence = date(year, 2, 28)
+        if occurrence >= today:
+            return occurrence
+    return None
+
+class ReminderScheduler:
+    """
+    纪念日提醒调度器
+    在内存中维护每个纪念日的下一次发生日期和提醒日期，按提醒日期排序
+    纪念日增删改时增量刷新，跨天时整体重算
+    查询到期提醒只需一次二分查找，无需每次全表扫描
+    """
+    
+    def __init__(self):
+        self.today = date.today()
+        self._entries = {}  # anniversary_id -> 提醒条目
+        self._index = []    # 按 (remind_date, anniversary_id) 排序的列表
+        self._changes = None  # 全量加载期间发生的增量变更，加载完成后重放
+        self.loaded_version = None  # 最近一次全量加载时anniversaries表的版本号
+        self._reload_lock = asyncio.Lock()
+    
+    def _build_entry(self, anniversary: dict) -> Optional[dict]:
+        anniversary_date = anniversary['date']
+        if isinstance(anniversary_date, str):
+            anniversary_date = datetime.strptime(anniversary_date, '%Y-%m-%d').date()
+        
+        occurrence = next_occurrence(anniversary_date, bool(anniversary['is_recurring']), self.today)
+        if occurrence is None:
+            return None
+        
+        reminder_days = max(anniversary.get('reminder_days') or 0, 0)
+        return {
+            "anniversary": anniversary,
+            "anniversary_date": anniversary_date,
+            "next_date": occurrence,
+            "remind_date": occurrence - timedelta(days=reminder_days)
+        }
+    
+    def upsert(self, anniversary: dict):
+        """新增或更新单个纪念日的提醒"""
+        anniversary = dict(anniversary)
+        if self._changes is not None:
+            self._changes.append((self._apply_upsert, anniversary))
+        self._apply_upsert(anniversary)
+    
+    def remove(self, anniversary_id: int):
+        """移除单个纪念日的提醒"""
+        if self._changes is not None:
+            self._changes.append((self._apply_remove, anniversary_id))
+        self._apply_remove(anniversary_id)
+    
+    def _apply_upsert(self, anniversary: dict):
+        self._apply_remove(anniversary['id'])
+        entry = self._build_entry(dict(anniversary))
+        if entry:
+            self._entries[anniversary['id']] = entry
+            bisect.insort(self._index, (entry['remind_date'], anniversary['id']))
+    
+    def _apply_remove(self, anniversary_id: int):
+        entry = self._entries.pop(anniversary_id, None)
+        if entry:
+            position = bisect.bisect_left(self._index, (entry['remind_date'], anniversary_id))
+            if position < len(self._index) and self._index[position] == (entry['remind_date'], anniversary_id):
+                self._index.pop(position)
+    
+    def rebuild(self, anniversaries: List[dict]):
+        """根据全部纪念日重建提醒"""
+        self.today = date.today()
+        self._entries = {}
+        self._index = []
+        for anniversary in anniversaries:
+            self._apply_upsert(anniversary)
+        logger.info(f"纪念日提醒已重建，共 {len(self._entries)} 条待提醒")
+    
+    def rollover(self):
+        """跨天时基于内存中的纪念日重新计算下一次发生日期"""
+        self.rebuild([entry['anniversary'] for entry in self._entries.values()])
+    
+    def due(self) -> List[dict]:
+        """获取当前到期的提醒（提醒日期已到、纪念日尚未过去）"""
+        if date.today() != self.today:
+            self.rollover()
+        
+        end = bisect.bisect_right(self._index, (self.today, float('inf')))
+        reminders = []
+        for _, anniversary_id in self._index[:end]:
+            entry = self._entries[anniversary_id]
+            reminder = dict(entry['anniversary'])
+            reminder['date'] = entry['anniversary_date'].strftime('%Y-%m-%d')
+            reminder['next_date'] = entry['next_date'].strftime('%Y-%m-%d')
+            reminder['remind_date'] = entry['remind_date'].strftime('%Y-%m-%d')
+            reminder['days_until'] = (entry['next_date'] - self.today).days
+            reminders.append(reminder)
+        
+        reminders.sort(key=lambda reminder: reminder['days_until'])
+        return reminders
+    
+    async def reload(self):
+        """
+        从数据库全量加载纪念日并重建提醒
+        加载在线程池中进行，期间发生的增删改会被记录，重建后按顺序重放，避免丢失
+        加载前先读取表版本号，加载到的数据不会早于该版本
+        """
+        async with self._reload_lock:
+            self._changes = []
+            try:
+                version = await asyncio.to_thread(get_table_version, "anniversaries")
+                anniversaries = await asyncio.to_thread(load_all_anniversaries)
+                changes = self._changes
+                self.rebuild(anniversaries)
+                for apply, argument in changes:
+                    apply(argument)
+                self.loaded_version = version['version']
+            finally:
+                self._changes = None
+    
+    async def refresh_if_changed(self):
+        """
+        检查anniversaries表版本号，与最近一次加载时不同则重新加载
+        用于获取其他进程对纪念日的修改；检查失败时继续使用内存中的提醒
+        """
+        try:
+            version = await asyncio.to_thread(get_table_version, "anniversaries")
+            if version['version'] != self.loaded_version:
+                await self.reload()
+        except Exception as e:
+            logger.warning(f"检查纪念日版本失败，使用内存中的提醒: {str(e)}")
+    
+    async def run(self):
+        """后台任务：启动时加载全部纪念日（失败则退避重试），之后每到零点重新加载"""
+        delay = 1
+        while True:
+            try:
+                await self.reload()
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"加载纪念日提醒失败，{delay}秒后重试: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60)
+        
+        while True:
+            now = datetime.now()
+            next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            await asyncio.sleep((next_midnight - now).total_seconds() + 1)
+            
+            try:
+                await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"加载纪念日提醒失败，使用内存中的纪念日重新计算: {str(e)}")
+                self.rollover()
+
+def load_all_anniversaries() -> List[dict]:
+    """读取全部纪念日，供提醒调度器使用"""
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    
+    try:
+        cursor.execute("SELECT * FROM anniversaries")
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        connection.close()
+
+reminder_scheduler = ReminderScheduler()
+
 # API路由
 @app.get("/")
 async def root():
     return RedirectResponse(url="/static/index.html")
 
-@app.get("/api/records", response_model=List[LoveRecord])
-async def get_records(category: Optional[str] = None, mood: Optional[str] = None):
-    """获取所有记录，支持按分类和心情筛选"""
+def query_records(category: Optional[str] = None, mood: Optional[str] = None) -> List[dict]:
+    """查询记录，支持按分类和心情筛选"""
     connection = get_db_connection()
     cursor = connection.cursor(dictionary=True)
     
@@ -277,6 +972,16 @@ async def get_records(category: Optional[str] = None, mood: Optional[str] = None
         cursor.close()
         connection.close()
 
+@app.get("/api/records", response_model=List[LoveRecord])
+async def get_records(request: Request, response: Response,
+                      category: Optional[str] = None, mood: Optional[str] = None):
+    """获取所有记录，支持按分类和心情筛选"""
+    not_modified, version = await check_not_modified(request, response, "love_records", category, mood)
+    if not_modified:
+        return not_modified
+    
+    return await read_flight.do(("records", version, category, mood), query_records, category, mood)
+
 @app.post("/api/records", response_model=LoveRecord)
 async def create_record(record: LoveRecordCreate, request: Request):
     """创建新记录"""
@@ -284,6 +989,8 @@ async def create_record(record: LoveRecordCreate, request: Request):
     cursor = connection.cursor(dictionary=True)
     
     try:
+        # 写入记录、调整月度汇总和更新表版本在同一事务中完成
+        connection.start_transaction()
         query = """
         INSERT INTO love_records (category, date, description, mood, timestamp)
         VALUES (%s, %s, %s, %s, %s)
@@ -300,10 +1007,15 @@ async def create_record(record: LoveRecordCreate, request: Request):
         record_id = cursor.lastrowid
         cursor.execute("SELECT * FROM love_records WHERE id = %s", (record_id,))
         new_record = cursor.fetchone()
+        adjust_monthly_stats(cursor, new_record, 1)
         
         if isinstance(new_record['date'], date):
             new_record['date'] = new_record['date'].strftime('%Y-%m-%d')
         
+        # 更新表版本，使相关缓存校验值失效
+        mark_table_changed(cursor, "love_records")
+        connection.commit()
+        
         # 记录操作日志
         log_operation("CREATE", "love_records", record_id, 
                      record.dict(), request)
@@ -312,6 +1024,9 @@ async def create_record(record: LoveRecordCreate, request: Request):
     except Error as e:
         raise HTTPException(status_code=500, detail=f"创建记录失败: {str(e)}")
     finally:
+        # 出错（包括400/404）时回滚未提交的事务
+        if connection.in_transaction:
+            connection.rollback()
         cursor.close()
         connection.close()
 
@@ -322,8 +1037,11 @@ async def update_record(record_id: int, record: LoveRecordUpdate, request: Reque
     cursor = connection.cursor(dictionary=True)
     
     try:
-        # 获取更新前的记录用于日志
-        cursor.execute("SELECT * FROM love_records WHERE id = %s", (record_id,))
+        # 更新记录、调整月度汇总和更新表版本在同一事务中完成
+        connection.start_transaction()
+        
+        # 获取更新前的记录用于日志和月度汇总调整
+        cursor.execute("SELECT * FROM love_records WHERE id = %s FOR UPDATE", (record_id,))
         old_record = cursor.fetchone()
         
         if not old_record:
@@ -365,9 +1083,18 @@ async def update_record(record_id: int, record: LoveRecordUpdate, request: Reque
         cursor.execute("SELECT * FROM love_records WHERE id = %s", (record_id,))
         updated_record = cursor.fetchone()
         
+        # 日期、分类或心情变化时同步调整月度汇总
+        if any(old_record[field] != updated_record[field] for field in ("date", "category", "mood")):
+            adjust_monthly_stats(cursor, old_record, -1)
+            adjust_monthly_stats(cursor, updated_record, 1)
+        
         if isinstance(updated_record['date'], date):
             updated_record['date'] = updated_record['date'].strftime('%Y-%m-%d')
         
+        # 更新表版本，使相关缓存校验值失效
+        mark_table_changed(cursor, "love_records")
+        connection.commit()
+        
         # 记录操作日志
         log_data = {
             "old_data": dict(old_record),
@@ -379,6 +1106,9 @@ async def update_record(record_id: int, record: LoveRecordUpdate, request: Reque
     except Error as e:
         raise HTTPException(status_code=500, detail=f"更新记录失败: {str(e)}")
     finally:
+        # 出错（包括400/404）时回滚未提交的事务
+        if connection.in_transaction:
+            connection.rollback()
         cursor.close()
         connection.close()
 
@@ -389,14 +1119,22 @@ async def delete_record(record_id: int, request: Request):
     cursor = connection.cursor(dictionary=True)
     
     try:
-        # 获取要删除的记录用于日志
-        cursor.execute("SELECT * FROM love_records WHERE id = %s", (record_id,))
+        # 删除记录、调整月度汇总和更新表版本在同一事务中完成
+        connection.start_transaction()
+        
+        # 获取要删除的记录用于日志和月度汇总调整
+        cursor.execute("SELECT * FROM love_records WHERE id = %s FOR UPDATE", (record_id,))
         record_to_delete = cursor.fetchone()
         
         if not record_to_delete:
             raise HTTPException(status_code=404, detail="记录不存在")
         
         cursor.execute("DELETE FROM love_records WHERE id = %s", (record_id,))
+        adjust_monthly_stats(cursor, record_to_delete, -1)
+        
+        # 更新表版本，使相关缓存校验值失效
+        mark_table_changed(cursor, "love_records")
+        connection.commit()
         
         # 记录操作日志
         log_operation("DELETE", "love_records", record_id, 
@@ -406,6 +1144,9 @@ async def delete_record(record_id: int, request: Request):
     except Error as e:
         raise HTTPException(status_code=500, detail=f"删除记录失败: {str(e)}")
     finally:
+        # 出错（包括400/404）时回滚未提交的事务
+        if connection.in_transaction:
+            connection.rollback()
         cursor.close()
         connection.close()
 
@@ -449,9 +1190,8 @@ async def export_records(category: Optional[str] = None):
         cursor.close()
         connection.close()
 
-@app.get("/api/stats")
-async def get_stats():
-    """获取统计信息"""
+def query_stats() -> dict:
+    """查询记录统计信息"""
     connection = get_db_connection()
     cursor = connection.cursor(dictionary=True)
     
@@ -486,10 +1226,163 @@ async def get_stats():
         cursor.close()
         connection.close()
 
+@app.get("/api/stats")
+async def get_stats(request: Request, response: Response):
+    """获取统计信息"""
+    not_modified, version = await check_not_modified(request, response, "love_records")
+    if not_modified:
+        return not_modified
+    
+    return await read_flight.do(("stats", version), query_stats)
+
+# 记录分析接口
+# 各时间粒度在love_records上的分桶表达式（按周分桶以周一为起点）
+RECORD_BUCKETS = {
+    "day": "date",
+    "week": "DATE_SUB(date, INTERVAL WEEKDAY(date) DAY)",
+    "month": "DATE_SUB(date, INTERVAL DAYOFMONTH(date) - 1 DAY)",
+    "year": "MAKEDATE(YEAR(date), 1)"
+}
+# 可由月度汇总表计算的时间粒度
+MONTHLY_STATS_BUCKETS = {
+    "month": "month",
+    "year": "MAKEDATE(YEAR(month), 1)"
+}
+ANALYTICS_GROUP_FIELDS = ("category", "mood")
+
+def first_day_of_next_month(day: date) -> date:
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
+
+def query_record_analytics(bucket: str, start: date, end: date, group_by: tuple,
+                           category: Optional[str] = None, mood: Optional[str] = None) -> List[dict]:
+    """
+    按时间分桶统计记录数
+    按月/按年统计时，完整月份从月度汇总表读取，首尾不完整的月份从love_records补充
+    按日/按周统计时直接在love_records上按日期范围分组
+    查询love_records时总是带上分类条件（未指定分类时使用全部分类），以使用(category, date)索引
+    """
+    connection = get_db_connection()
+    cursor = connection.cursor(dictionary=True)
+    all_categories = None
+    
+    def run(table: str, bucket_expr: str, date_field: str, count_expr: str, range_start: date, range_end: date):
+        """统计 [range_start, range_end) 范围内的数据"""
+        nonlocal all_categories
+        select_fields = [f"{bucket_expr} AS bucket"] + list(group_by)
+        query = f"SELECT {', '.join(select_fields)}, {count_expr} AS count FROM {table} WHERE {date_field} >= %s AND {date_field} < %s"
+        params = [range_start, range_end]
+        
+        if category:
+            query += " AND category = %s"
+            params.append(category)
+        elif table == "love_records":
+            # 分类取自月度汇总表（数据量很小），按分类列表做范围查询
+            if all_categories is None:
+                cursor.execute("SELECT DISTINCT category FROM love_record_monthly_stats WHERE record_count > 0")
+                all_categories = [row['category'] for row in cursor.fetchall()]
+            if not all_categories:
+                return []
+            query += f" AND category IN ({', '.join(['%s'] * len(all_categories))})"
+            params.extend(all_categories)
+        
+        if mood:
+            query += " AND mood = %s"
+            params.append(mood)
+        
+        query += f" GROUP BY {', '.join(['bucket'] + list(group_by))}"
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    
+    try:
+        end_exclusive = end + timedelta(days=1)
+        rows = []
+        
+        if bucket in MONTHLY_STATS_BUCKETS:
+            full_start = start if start.day == 1 else first_day_of_next_month(start)
+            full_end = date(end_exclusive.year, end_exclusive.month, 1)
+            if full_start < full_end:
+                rows += run("love_record_monthly_stats", MONTHLY_STATS_BUCKETS[bucket], "month",
+                            "SUM(record_count)", full_start, full_end)
+                if start < full_start:
+                    rows += run("love_records", RECORD_BUCKETS[bucket], "date", "COUNT(*)", start, full_start)
+                if full_end < end_exclusive:
+                    rows += run("love_records", RECORD_BUCKETS[bucket], "date", "COUNT(*)", full_end, end_exclusive)
+            else:
+                rows += run("love_records", RECORD_BUCKETS[bucket], "date", "COUNT(*)", start, end_exclusive)
+        else:
+            rows += run("love_records", RECORD_BUCKETS[bucket], "date", "COUNT(*)", start, end_exclusive)
+        
+        # 合并汇总表与明细表的结果
+        counts = {}
+        for row in rows:
+            bucket_date = row['bucket']
+            if isinstance(bucket_date, date):
+                bucket_date = bucket_date.strftime('%Y-%m-%d')
+            key = (bucket_date,) + tuple(row[field] for field in group_by)
+            counts[key] = counts.get(key, 0) + int(row['count'])
+        
+        series = []
+        for key in sorted(counts):
+            count = counts[key]
+            if count <= 0:
+                continue
+            item = {"bucket": key[0]}
+            item.update(zip(group_by, key[1:]))
+            item["count"] = count
+            series.append(item)
+        return series
+    except Error as e:
+        raise HTTPException(status_code=500, detail=f"查询记录分析失败: {str(e)}")
+    finally:
+        cursor.close()
+        connection.close()
+
+@app.get("/api/analytics/records")
+async def get_record_analytics(request: Request, response: Response,
+                               bucket: str = "month", start: Optional[date] = None, end: Optional[date] = None,
+                               group_by: str = "category",
+                               category: Optional[str] = None, mood: Optional[str] = None):
+    """
+    按日/周/月/年统计记录数，可按分类和/或心情细分
+    group_by 为逗号分隔的细分字段（category、mood），传空字符串表示不细分
+    end 默认为今天，start 默认为去年同月的第一天
+    """
+    if bucket not in RECORD_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"不支持的时间粒度: {bucket}")
+    
+    fields = tuple(dict.fromkeys(field.strip() for field in group_by.split(",") if field.strip()))
+    unknown = [field for field in fields if field not in ANALYTICS_GROUP_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"不支持的细分字段: {', '.join(unknown)}")
+    
+    # 未指定结束日期时结果随日期变化
+    daily = end is None
+    end = end or date.today()
+    start = start or date(end.year - 1, end.month, 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="开始日期不能晚于结束日期")
+    
+    not_modified, version = await check_not_modified(request, response, "love_records",
+                                                     bucket, start, end, fields, category, mood,
+                                                     daily=daily)
+    if not_modified:
+        return not_modified
+    
+    series = await read_flight.do(("analytics", version, bucket, start, end, fields, category, mood),
+                                  query_record_analytics, bucket, start, end, fields, category, mood)
+    return {
+        "bucket": bucket,
+        "start": start.strftime('%Y-%m-%d'),
+        "end": end.strftime('%Y-%m-%d'),
+        "group_by": list(fields),
+        "series": series
+    }
+
 # 纪念日相关API接口
-@app.get("/api/anniversaries", response_model=List[Anniversary])
-async def get_anniversaries(category: Optional[str] = None):
-    """获取所有纪念日，支持按分类筛选"""
+def query_anniversaries(category: Optional[str] = None) -> List[dict]:
+    """查询纪念日，支持按分类筛选"""
     connection = get_db_connection()
     cursor = connection.cursor(dictionary=True)
     
@@ -518,6 +1411,15 @@ async def get_anniversaries(category: Optional[str] = None):
         cursor.close()
         connection.close()
 
+@app.get("/api/anniversaries", response_model=List[Anniversary])
+async def get_anniversaries(request: Request, response: Response, category: Optional[str] = None):
+    """获取所有纪念日，支持按分类筛选"""
+    not_modified, version = await check_not_modified(request, response, "anniversaries", category)
+    if not_modified:
+        return not_modified
+    
+    return await read_flight.do(("anniversaries", version, category), query_anniversaries, category)
+
 @app.post("/api/anniversaries", response_model=Anniversary)
 async def create_anniversary(anniversary: AnniversaryCreate, request: Request):
     """创建新纪念日"""
@@ -537,10 +1439,14 @@ async def create_anniversary(anniversary: AnniversaryCreate, request: Request):
         # 获取创建的记录
         cursor.execute("SELECT * FROM anniversaries WHERE id = %s", (anniversary_id,))
         new_anniversary = cursor.fetchone()
+        reminder_scheduler.upsert(new_anniversary)
         
         if isinstance(new_anniversary['date'], date):
             new_anniversary['date'] = new_anniversary['date'].strftime('%Y-%m-%d')
         
+        # 更新表版本，使相关缓存校验值失效
+        mark_table_changed(cursor, "anniversaries")
+        
         # 记录操作日志
         log_operation("CREATE", "anniversaries", anniversary_id, 
                      anniversary.dict(), request)
@@ -604,10 +1510,14 @@ async def update_anniversary(anniversary_id: int, anniversary: AnniversaryUpdate
         # 获取更新后的记录
         cursor.execute("SELECT * FROM anniversaries WHERE id = %s", (anniversary_id,))
         updated_anniversary = cursor.fetchone()
+        reminder_scheduler.upsert(updated_anniversary)
         
         if isinstance(updated_anniversary['date'], date):
             updated_anniversary['date'] = updated_anniversary['date'].strftime('%Y-%m-%d')
         
+        # 更新表版本，使相关缓存校验值失效
+        mark_table_changed(cursor, "anniversaries")
+        
         # 记录操作日志
         log_data = {
             "old_data": dict(old_anniversary),
@@ -637,6 +1547,10 @@ async def delete_anniversary(anniversary_id: int, request: Request):
             raise HTTPException(status_code=404, detail="纪念日不存在")
         
         cursor.execute("DELETE FROM anniversaries WHERE id = %s", (anniversary_id,))
+        reminder_scheduler.remove(anniversary_id)
+        
+        # 更新表版本，使相关缓存校验值失效
+        mark_table_changed(cursor, "anniversaries")
         
         # 记录操作日志
         log_operation("DELETE", "anniversaries", anniversary_id, 
@@ -649,9 +1563,8 @@ async def delete_anniversary(anniversary_id: int, request: Request):
         cursor.close()
         connection.close()
 
-@app.get("/api/anniversaries/upcoming")
-async def get_upcoming_anniversaries(days: int = 30):
-    """获取即将到来的纪念日（未来指定天数内）"""
+def query_upcoming_anniversaries(days: int = 30) -> List[dict]:
+    """查询未来指定天数内的纪念日"""
     connection = get_db_connection()
     cursor = connection.cursor(dictionary=True)
     
@@ -695,6 +1608,75 @@ async def get_upcoming_anniversaries(days: int = 30):
         cursor.close()
         connection.close()
 
+@app.get("/api/anniversaries/upcoming")
+async def get_upcoming_anniversaries(request: Request, response: Response, days: int = 30):
+    """获取即将到来的纪念日（未来指定天数内）"""
+    # 结果依赖当前日期，日期变化后校验值随之变化
+    not_modified, version = await check_not_modified(request, response, "anniversaries", days, daily=True)
+    if not_modified:
+        return not_modified
+    
+    return await read_flight.do(("upcoming", version, days), query_upcoming_anniversaries, days)
+
+@app.get("/api/anniversaries/reminders")
+async def get_due_reminders():
+    """获取当前到期的纪念日提醒（已进入提醒期且纪念日尚未过去）"""
+    await reminder_scheduler.refresh_if_changed()
+    return reminder_scheduler.due()
+
+# 页面初始化聚合接口
+BOOTSTRAP_SECTIONS = ("records", "stats", "anniversaries", "upcoming")
+BOOTSTRAP_TABLES = {
+    "records": "love_records",
+    "stats": "love_records",
+    "anniversaries": "anniversaries",
+    "upcoming": "anniversaries"
+}
+
+@app.get("/api/bootstrap")
+async def get_bootstrap(sections: Optional[str] = None,
+                        category: Optional[str] = None, mood: Optional[str] = None,
+                        anniversary_category: Optional[str] = None, days: int = 30):
+    """
+    页面初始化聚合接口
+    一次请求返回记录、统计、纪念日和即将到来的纪念日
+    各部分查询在线程池中并发执行（并与相同的进行中查询合并），总耗时取决于最慢的查询
+    sections 为逗号分隔的部分名称，不传则返回全部
+    """
+    if sections:
+        requested = [section.strip() for section in sections.split(",") if section.strip()]
+        unknown = [section for section in requested if section not in BOOTSTRAP_SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"未知的数据部分: {', '.join(unknown)}")
+    else:
+        requested = list(BOOTSTRAP_SECTIONS)
+    
+    # 去重并保持顺序
+    requested = list(dict.fromkeys(requested))
+    
+    # 读取涉及的表版本，合并键与对应接口一致，与单独请求的相同查询共享结果
+    tables = list(dict.fromkeys(BOOTSTRAP_TABLES[section] for section in requested))
+    table_versions = await asyncio.gather(*(asyncio.to_thread(get_table_version, table) for table in tables))
+    versions = {table: version['version'] for table, version in zip(tables, table_versions)}
+    records_version = versions.get("love_records")
+    anniversaries_version = versions.get("anniversaries")
+    
+    queries = {
+        "records": (("records", records_version, category, mood), query_records, category, mood),
+        "stats": (("stats", records_version), query_stats),
+        "anniversaries": (("anniversaries", anniversaries_version, anniversary_category),
+                          query_anniversaries, anniversary_category),
+        "upcoming": (("upcoming", anniversaries_version, days), query_upcoming_anniversaries, days)
+    }
+    
+    results = await asyncio.gather(*(read_flight.do(*queries[section]) for section in requested))
+    return dict(zip(requested, results))
+
+@app.get("/api/metrics/coalescing")
+async def get_coalescing_metrics():
+    """获取读请求合并统计（实际查询数、被合并请求数、超时数、进行中查询数）"""
+    return read_flight.metrics()
+
 @app.get("/api/operation-logs", response_model=List[OperationLog])
 async def get_operation_logs(limit: int = 100, offset: int = 0, table_name: Optional[str] = None):
     """获取操作日志"""
@@ -781,8 +1763,15 @@ async def get_operation_stats():
         cursor.close()
         connection.close()
 
-# 挂载静态文件
-app.mount("/static", StaticFiles(directory="static", html=True), name="static")
+# 挂载静态文件（启动时预压缩，并提供带内容哈希的文件名）
+static_files = PrecompressedStaticFiles(directory="static", html=True, precompress=STATIC_PRECOMPRESS)
+
+@app.get("/api/static-manifest")
+async def get_static_manifest():
+    """获取静态文件的带哈希文件名映射，前端据此引用可长期缓存的资源"""
+    return static_files.manifest()
+
+app.mount("/static", static_files, name="static")
 
 # 启动服务器
 if __name__ == "__main__":